@@ -8,12 +8,33 @@ any language. It mirrors the TypeScript security agent's functionality.
 Run with: uvicorn agent:app --host 127.0.0.1 --port 9210
 """
 
+import asyncio
+import hashlib
+import json
+import os
 import re
-from typing import Any, Literal, NamedTuple, Pattern
-
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from concurrent.futures import BrokenExecutor, Executor
+from contextlib import asynccontextmanager
+from typing import Any, Iterator, Literal, NamedTuple, Pattern
+
+import orjson
 from fastapi import FastAPI, Header, Request
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+
+try:
+    # RE2 runs the keyword gate and header walk over the whole diff as a
+    # linear-time DFA. The stdlib engine still matches the secret patterns on the candidate
+    # lines: google-re2's per-search overhead costs more than the matching
+    # itself once secrets are common (e.g. a committed .env file). The
+    # patterns are bytes, which the stdlib engine already matches as ASCII.
+    import re2
+except ImportError:
+    re2 = None
 
 # =============================================================================
 # Configuration
@@ -22,6 +43,17 @@ from pydantic import BaseModel
 PORT = 9210
 PROTOCOL_VERSION = "1.0"
 SKILL_VERSION = "1.0"
+ANALYSIS_CACHE_SIZE = 512
+# Diffs with at least this many lines (about 10 ms of scanning) are
+# scanned across worker processes, off the event loop
+PARALLEL_MIN_LINES = 2_000
+# CPUs this process may run on. os.cpu_count() reports every CPU on the
+# host, even inside a container or cpuset limited to fewer.
+SCAN_WORKERS = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+# /rpc success responses with more findings than this are streamed
+STREAM_MIN_FINDINGS = 4_096
+# Findings serialized per chunk of a streamed /rpc response
+STREAM_BATCH_SIZE = 256
 
 # =============================================================================
 # Models
@@ -58,6 +90,9 @@ class AgentCard(BaseModel):
     auth: Auth
 
 
+# Finding and ReviewResult document the wire format. analyze_diff builds
+# plain dicts with the same keys, and handle_rpc sends them without
+# re-validating.
 class Finding(BaseModel):
     severity: Literal["low", "medium", "high", "critical"]
     title: str
@@ -155,6 +190,10 @@ AGENT_CARD = AgentCard(
     auth=Auth(type="none"),
 )
 
+# Discovery and health responses never change, so render them once
+AGENT_CARD_JSON = AGENT_CARD.model_dump_json().encode()
+HEALTH_JSON = b'{"status":"ok","agent":"python-security-agent"}'
+
 # =============================================================================
 # Security Analysis
 # =============================================================================
@@ -163,93 +202,396 @@ Severity = Literal["low", "medium", "high", "critical"]
 
 
 class SecretPattern(NamedTuple):
-    pattern: Pattern[str]
+    name: str
+    pattern: str
     title: str
     severity: Severity
     recommendation: str
+    # The pattern stops before the closing quote of a quoted value; the
+    # scanner checks for it (see scan_diff)
+    quoted: bool = False
 
 
-# Patterns to detect secrets
+# Patterns to detect secrets. Each one becomes a named group of SECRET_RE,
+# so names must be valid group identifiers. Quoted values and tokens are
+# length-bounded so a long unterminated line cannot drive a backtracking
+# engine into quadratic work. A longer value or token still matches; only
+# its evidence is cut at the bound.
 SECRET_PATTERNS: list[SecretPattern] = [
     SecretPattern(
-        re.compile(r'(API_KEY|api_key|apiKey)\s*[=:]\s*["\']([^"\']+)["\']', re.IGNORECASE),
+        "api_key",
+        r'(?i:(API_KEY|api_key|apiKey)\s*[=:]\s*["\']([^"\'\n]{1,256}))',
         "API Key",
         "high",
         "Move API keys to environment variables or a secrets manager",
+        quoted=True,
     ),
     SecretPattern(
-        re.compile(r'(PASSWORD|password|passwd)\s*[=:]\s*["\']([^"\']+)["\']', re.IGNORECASE),
+        "password",
+        r'(?i:(PASSWORD|password|passwd)\s*[=:]\s*["\']([^"\'\n]{1,256}))',
         "Hardcoded password",
         "critical",
         "Use environment variables or a secrets manager for passwords",
+        quoted=True,
     ),
     SecretPattern(
-        re.compile(r'(SECRET|secret|SECRET_KEY|secret_key)\s*[=:]\s*["\']([^"\']+)["\']', re.IGNORECASE),
+        "secret",
+        r'(?i:(SECRET|secret|SECRET_KEY|secret_key)\s*[=:]\s*["\']([^"\'\n]{1,256}))',
         "Hardcoded secret",
         "high",
         "Move secrets to environment variables or a secrets manager",
+        quoted=True,
     ),
     SecretPattern(
-        re.compile(r'(sk_live_|sk_test_|pk_live_|pk_test_)[a-zA-Z0-9]+'),
+        "stripe_key",
+        r'(sk_live_|sk_test_|pk_live_|pk_test_)[A-Za-z0-9]{1,256}',
         "Stripe API Key",
         "critical",
         "Remove Stripe keys from code; use environment variables",
     ),
     SecretPattern(
-        re.compile(r'(ghp_|gho_|ghu_|ghs_|ghr_)[a-zA-Z0-9]+'),
+        "github_token",
+        r'(ghp_|gho_|ghu_|ghs_|ghr_)[A-Za-z0-9]{1,256}',
         "GitHub Token",
         "critical",
         "Remove GitHub tokens from code; use environment variables",
     ),
 ]
 
+# All patterns fused into one alternation so each line is scanned once;
+# the named group that matched identifies which pattern fired. Diffs are
+# scanned as UTF-8 bytes, so the pattern is compiled as bytes too.
+SECRET_RE: Pattern[bytes] = re.compile(
+    "|".join(f"(?P<{p.name}>{p.pattern})" for p in SECRET_PATTERNS).encode()
+)
 
-def analyze_diff(diff: str) -> list[Finding]:
-    """Analyze a diff for security issues."""
-    findings: list[Finding] = []
-    lines = diff.split("\n")
 
-    current_file: str | None = None
-    current_line = 0
+def secret_group_table(field: str, unused: Any) -> list[Any]:
+    """Return a SecretPattern field for each pattern, indexed by its SECRET_RE group number.
+
+    Slots for the patterns' inner groups hold unused; match.lastindex is
+    always a pattern's own named group.
+    """
+    table: list[Any] = [unused] * (SECRET_RE.groups + 1)
+    for secret in SECRET_PATTERNS:
+        table[SECRET_RE.groupindex[secret.name]] = getattr(secret, field)
+    return table
+
+
+# Finding metadata as parallel lists indexed by match.lastindex, so a hit
+# costs a few list indexes
+SECRET_TITLES: list[str] = secret_group_table("title", "")
+SECRET_SEVERITIES: list[str] = secret_group_table("severity", "")
+SECRET_RECOMMENDATIONS: list[str] = secret_group_table("recommendation", "")
+SECRET_QUOTED: list[bool] = secret_group_table("quoted", False)
+
+# Lowercase literals, at least one of which appears in the lowercased form
+# of any line SECRET_RE can match. Lines containing none of them skip the
+# full regex. Keep in sync with SECRET_PATTERNS; check_secret_keywords()
+# fails the import if a pattern has no keyword.
+SECRET_KEYWORDS: tuple[bytes, ...] = (
+    b"api_key",
+    b"apikey",
+    b"passw",
+    b"secret",
+    b"sk_live_",
+    b"sk_test_",
+    b"pk_live_",
+    b"pk_test_",
+    b"ghp_",
+    b"gho_",
+    b"ghu_",
+    b"ghs_",
+    b"ghr_",
+)
 
-    for line in lines:
-        # Track file changes
-        if line.startswith("+++ b/"):
-            current_file = line[6:]
-            continue
-        elif line.startswith("@@ "):
-            # Parse line number from hunk header
-            match = re.search(r'\+(\d+)', line)
-            if match:
-                current_line = int(match.group(1)) - 1
-            continue
 
-        # Only check added lines
-        if not line.startswith("+") or line.startswith("+++"):
-            if line.startswith(" "):
-                current_line += 1
+def check_secret_keywords() -> None:
+    """Raise ValueError if a secret pattern could match without a keyword.
+
+    Each pattern opens with a group of literal alternatives (key names or
+    token prefixes), and every one of them must contain a keyword, or
+    lines holding it would never reach SECRET_RE.
+    """
+    for secret in SECRET_PATTERNS:
+        prefixes = re.search(r"\(([\w|]+)\)", secret.pattern)
+        if prefixes is None:
+            raise ValueError(f"Secret pattern {secret.name} does not open with a group of literal prefixes")
+        for prefix in prefixes.group(1).split("|"):
+            lowered = prefix.lower().encode()
+            if not any(keyword in lowered for keyword in SECRET_KEYWORDS):
+                raise ValueError(f"SECRET_KEYWORDS has no keyword for {prefix!r} in secret pattern {secret.name}")
+
+
+check_secret_keywords()
+
+# Coarse gate run over the whole lowercased diff: an added line containing
+# a keyword. Matching lowercase literals case-sensitively is about twice as
+# fast as (?i) in the stdlib engine. The keywords are plain identifier
+# characters, so they need no escaping. "+++" header lines also pass and
+# are dropped by the caller.
+CANDIDATE_LINE_RE: Pattern[bytes] = (re2 or re).compile(
+    rb"(?m)^\+[^\n]*?(?:" + b"|".join(SECRET_KEYWORDS) + b")"
+)
+
+# Characters that close a quoted value
+QUOTES = (b'"', b"'")
+
+# Lines that change the file or line being tracked. Like the gate, this is
+# searched across the stretches between candidates, so it runs on RE2 too.
+HEADER_RE: Pattern[bytes] = (re2 or re).compile(rb"(?m)^(?:\+\+\+ b/|@@ )")
+
+# New-file start line in a hunk header: "@@ -10,6 +12,7 @@"
+HUNK_RE: Pattern[bytes] = re.compile(rb"\+(\d+)")
+
+
+def count_new_lines(diff: bytes, start: int, end: int) -> int:
+    """Count lines beginning in diff[start:end] that take a new-file line number.
+
+    Those are context (" ") and added ("+") lines, excluding "+++" headers.
+    start must be the beginning of a line.
+    """
+    if start >= end:
+        return 0
+    count = diff.count(b"\n ", start, end) + diff.count(b"\n+", start, end) - diff.count(b"\n+++", start, end)
+    if diff[start] in b" +" and not diff.startswith(b"+++", start):
+        count += 1
+    return count
+
+
+def candidate_lines(diff: bytes) -> Iterator[int]:
+    """Yield the start of each added line containing a secret keyword.
+
+    Lines are matched case-insensitively. "+++" header lines may also be
+    yielded; callers skip them.
+    """
+    # bytes.lower() keeps offsets, so positions apply to diff unchanged
+    for candidate in CANDIDATE_LINE_RE.finditer(diff.lower()):
+        yield candidate.start()
+
+
+def scan_diff(
+    diff: bytes,
+    current_file: str | None = None,
+    current_line: int = 0,
+) -> list[dict[str, Any]]:
+    """Scan a UTF-8 diff (or a slice of one) for secrets, returning Finding-shaped dicts.
+
+    Rather than visiting each line in Python, candidate_lines() finds the
+    added lines holding a keyword in one pass, and only those are examined.
+    The file and line number for each are caught up from the previous
+    candidate by locating headers with HEADER_RE and counting line prefixes
+    in between, all in C.
+    """
+    findings: list[dict[str, Any]] = []
+    search = SECRET_RE.search
+    header_search = HEADER_RE.search
+    titles = SECRET_TITLES
+    severities = SECRET_SEVERITIES
+    recommendations = SECRET_RECOMMENDATIONS
+    quoted = SECRET_QUOTED
+    size = len(diff)
+    # Start of the first line not yet reflected in current_file/current_line
+    pos = 0
+
+    for start in candidate_lines(diff):
+        if diff.startswith(b"+++", start):
             continue
 
-        current_line += 1
-        content = line[1:]  # Remove the + prefix
-
-        # Check each pattern
-        for pattern, title, severity, recommendation in SECRET_PATTERNS:
-            match = pattern.search(content)
-            if match:
-                # Extract matched text for evidence
-                evidence = f"Found: {match.group(0)}"
-
-                finding = Finding(
-                    severity=severity,
-                    title=title,
-                    evidence=evidence,
-                    recommendation=recommendation,
-                    file=current_file,
-                    line=current_line,
-                )
-                findings.append(finding)
+        header = header_search(diff, pos, start)
+        while header:
+            header_start = header.start()
+            current_line += count_new_lines(diff, pos, header_start)
+            header_end = diff.find(b"\n", header_start)
+            if header_end == -1:
+                header_end = size
+            if diff.startswith(b"+++ b/", header_start):
+                # Track file changes
+                current_file = diff[header_start + 6 : header_end].decode("utf-8", "replace")
+            else:
+                # Parse line number from hunk header
+                match = HUNK_RE.search(diff, header_start, header_end)
+                if match:
+                    current_line = int(match.group(1)) - 1
+            pos = header_end + 1
+            header = header_search(diff, pos, start)
+
+        end = diff.find(b"\n", start)
+        if end == -1:
+            end = size
+        current_line += count_new_lines(diff, pos, end)
+        pos = end + 1
+
+        # Report every match on the line. Scanning resumes one character
+        # past each hit rather than at its end (as finditer would), so a
+        # token nested inside another match (e.g. a Stripe key quoted in an
+        # API_KEY assignment) is still found. The line is searched in place
+        # via pos/endpos rather than sliced out.
+        #
+        # A quoted value must be closed later on the line. Checking that
+        # here rather than in the pattern keeps values longer than the
+        # pattern's bound reported, with their evidence cut at the bound.
+        match = search(diff, start + 1, end)
+        while match:
+            group = match.lastindex
+            match_end = match.end()
+            if quoted[group]:
+                if diff.startswith(QUOTES, match_end, end):
+                    match_end += 1
+                elif diff.find(b'"', match_end, end) == -1 and diff.find(b"'", match_end, end) == -1:
+                    match = search(diff, match.start() + 1, end)
+                    continue
+            evidence = diff[match.start() : match_end].decode("utf-8", "replace")
+            findings.append(
+                {
+                    "severity": severities[group],
+                    "title": titles[group],
+                    "evidence": f"Found: {evidence}",
+                    "recommendation": recommendations[group],
+                    "file": current_file,
+                    "line": current_line,
+                }
+            )
+            match = search(diff, match.start() + 1, end)
+
+    return findings
+
 
+def split_diff(diff: bytes, parts: int) -> list[tuple[bytes, str | None]]:
+    """Split a diff at hunk headers into roughly equal (text, file) chunks.
+
+    Every chunk after the first starts at a parseable "@@ " header, which
+    resets the line counter, so only the file being patched needs carrying
+    over. It is taken from the last "+++ b/" line before the chunk.
+    """
+    chunks: list[tuple[bytes, str | None]] = []
+    size = len(diff)
+    chunk_start = 0
+    chunk_file: str | None = None
+
+    for part in range(1, parts):
+        pos = diff.find(b"\n@@ ", max(part * size // parts, chunk_start))
+        # Headers the scanner cannot parse do not reset the line counter,
+        # so they are not safe split points
+        while pos != -1:
+            header_end = diff.find(b"\n", pos + 1)
+            if header_end == -1:
+                header_end = size
+            if HUNK_RE.search(diff, pos + 1, header_end):
+                break
+            pos = diff.find(b"\n@@ ", header_end)
+        if pos == -1:
+            break
+
+        chunks.append((diff[chunk_start : pos + 1], chunk_file))
+        chunk_start = pos + 1
+        file_pos = diff.rfind(b"\n+++ b/", 0, chunk_start) + 1
+        if file_pos or diff.startswith(b"+++ b/"):
+            file_end = diff.find(b"\n", file_pos)
+            chunk_file = diff[file_pos + 6 : file_end].decode("utf-8", "replace")
+
+    chunks.append((diff[chunk_start:], chunk_file))
+    return chunks
+
+
+# Started with the app (see lifespan) when more than one CPU is available
+scan_executor: Executor | None = None
+
+
+def exit_with_agent(agent_pid: int) -> None:
+    """Make this scan worker exit once the agent process is gone.
+
+    A worker blocks reading its task queue, which never reaches EOF if the
+    agent is killed outright (e.g. by the OOM killer), so it would linger.
+    """
+
+    def watch() -> None:
+        while True:
+            time.sleep(1)
+            try:
+                os.kill(agent_pid, 0)
+            except OSError:
+                os._exit(0)
+
+    threading.Thread(target=watch, daemon=True).start()
+
+
+def start_scan_executor() -> Executor:
+    """Start a pool of SCAN_WORKERS worker processes for analyze_diff."""
+    # Imported here: multiprocessing is a noticeable share of cold-start
+    # import time and single-CPU deployments never need it
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Workers start lazily, mid-request, after uvicorn has bound its socket.
+    # Forked workers would inherit the listening and client sockets, keeping
+    # the port bound after the agent dies and keep-alive connections from
+    # closing. Forkserver workers start from a clean process instead.
+    return ProcessPoolExecutor(
+        max_workers=SCAN_WORKERS,
+        mp_context=multiprocessing.get_context("forkserver"),
+        initializer=exit_with_agent,
+        initargs=(os.getpid(),),
+    )
+
+
+async def analyze_diff(diff: bytes) -> list[dict[str, Any]]:
+    """Analyze a UTF-8 diff for security issues, returning Finding-shaped dicts.
+
+    Added lines are independent once their file and line are known, so
+    large diffs are split at hunk headers and scanned on scan_executor
+    while the event loop keeps serving other requests. Smaller diffs are
+    scanned inline.
+    """
+    global scan_executor
+    executor = scan_executor
+    if executor is None or diff.count(b"\n") < PARALLEL_MIN_LINES:
+        return scan_diff(diff)
+
+    loop = asyncio.get_running_loop()
+    try:
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, scan_diff, text, file) for text, file in split_diff(diff, SCAN_WORKERS))
+        )
+    except BrokenExecutor:
+        # A worker died (e.g. OOM-killed), which breaks the whole pool.
+        # Replace it for later diffs, unless a concurrent request already
+        # has, and scan this one here.
+        if scan_executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            scan_executor = start_scan_executor()
+        return scan_diff(diff)
+
+    findings: list[dict[str, Any]] = []
+    for chunk_findings in results:
+        findings.extend(chunk_findings)
+    return findings
+
+
+# Webhook redeliveries and CI retries resend identical diffs, so results are
+# kept per diff digest in a small LRU. The cache is only touched from the
+# event loop, so no locking is needed; concurrent requests for the same new
+# diff may each scan it.
+analysis_cache: OrderedDict[bytes, list[dict[str, Any]]] = OrderedDict()
+
+
+async def analyze_diff_cached(diff: str) -> list[dict[str, Any]]:
+    """Encode diff and return analyze_diff() for it, reusing the result for a repeated diff."""
+    # Encoded once for both the cache key and the scan. A diff can carry
+    # lone surrogates from "\ud800"-style JSON escapes (see
+    # parse_rpc_request), which surrogatepass encodes instead of failing on;
+    # the scanner decodes evidence with "replace", so they come back as U+FFFD.
+    encoded = diff.encode("utf-8", "surrogatepass")
+    key = hashlib.blake2b(encoded, digest_size=16).digest()
+    findings = analysis_cache.get(key)
+    if findings is not None:
+        analysis_cache.move_to_end(key)
+        return findings
+
+    findings = await analyze_diff(encoded)
+    analysis_cache[key] = findings
+    if len(analysis_cache) > ANALYSIS_CACHE_SIZE:
+        analysis_cache.popitem(last=False)
     return findings
 
 
@@ -257,56 +599,116 @@ def analyze_diff(diff: str) -> list[Finding]:
 # FastAPI App
 # =============================================================================
 
-app = FastAPI(title="Python Security Agent")
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run the scan worker pool for the lifetime of the app."""
+    global scan_executor
+    if SCAN_WORKERS > 1:
+        scan_executor = start_scan_executor()
+    try:
+        yield
+    finally:
+        if scan_executor is not None:
+            scan_executor.shutdown(cancel_futures=True)
+            scan_executor = None
+
+
+app = FastAPI(
+    title="Python Security Agent",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+
+def findings_response(rpc_id: str, findings: list[dict[str, Any]]) -> Response:
+    """Return a JSON-RPC success envelope for findings.
+
+    The bytes are the same JSON as a JsonRpcSuccessResponse holding a
+    ReviewResult. Usually they are serialized in one call and sent with a
+    Content-Length. Diffs that leak thousands of secrets (e.g. a committed
+    .env) are streamed instead, so the whole payload is never built at once.
+    """
+    if len(findings) <= STREAM_MIN_FINDINGS:
+        return Response(
+            content=orjson.dumps({"jsonrpc": "2.0", "id": rpc_id, "result": {"findings": findings}}),
+            media_type="application/json",
+        )
+    return StreamingResponse(stream_findings(rpc_id, findings), media_type="application/json")
+
+
+async def stream_findings(rpc_id: str, findings: list[dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Yield the findings_response() envelope a batch of findings at a time."""
+    # An async generator, since Starlette runs sync iterators in its
+    # threadpool with a thread hop per chunk
+    dumps = orjson.dumps
+    yield b'{"jsonrpc":"2.0","id":' + dumps(rpc_id) + b',"result":{"findings":['
+    for offset in range(0, len(findings), STREAM_BATCH_SIZE):
+        batch = b",".join(dumps(finding) for finding in findings[offset : offset + STREAM_BATCH_SIZE])
+        yield b"," + batch if offset else batch
+    yield b"]}}"
 
 
-@app.get("/.well-known/agent-card.json")
-async def get_agent_card() -> AgentCard:
+@app.get("/.well-known/agent-card.json", response_model=AgentCard)
+async def get_agent_card() -> Response:
     """Return the Agent Card for discovery."""
-    return AGENT_CARD
+    return Response(content=AGENT_CARD_JSON, media_type="application/json")
 
 
-@app.get("/health")
-async def health_check() -> dict[str, str]:
+@app.get("/health", response_model=dict[str, str])
+async def health_check() -> Response:
     """Health check endpoint."""
-    return {"status": "ok", "agent": "python-security-agent"}
+    return Response(content=HEALTH_JSON, media_type="application/json")
+
+
+def parse_rpc_request(body: bytes) -> JsonRpcRequest:
+    """Parse and validate a JSON-RPC envelope straight from the raw body.
+
+    Raises ValidationError for JSON that is not a valid request, and
+    ValueError for a body that is not JSON at all.
+    """
+    try:
+        return JsonRpcRequest.model_validate_json(body)
+    except ValidationError as e:
+        if not any(error["type"] == "json_invalid" for error in e.errors()):
+            raise
+    # pydantic-core's parser rejects some JSON the stdlib accepts, notably
+    # lone surrogate escapes ("\ud800") in a diff, so retry with json.loads
+    # before calling the body a parse error
+    return JsonRpcRequest.model_validate(json.loads(body))
 
 
 @app.post("/rpc")
 async def handle_rpc(
     request: Request,
     authorization: str | None = Header(default=None),
-) -> JSONResponse:
+) -> Response:
     """Handle JSON-RPC 2.0 invoke requests."""
     rpc_id: str | None = None
 
+    # The body is read whatever its Content-Type, as it always has been
     try:
-        body = await request.json()
-    except Exception:
-        return JSONResponse(
+        rpc_request = parse_rpc_request(await request.body())
+        rpc_id = rpc_request.id
+    except ValidationError as e:
+        return ORJSONResponse(
             status_code=200,
             content=JsonRpcErrorResponse(
-                id=None,
-                error=JsonRpcError(code=-32700, message="Parse error"),
+                id=rpc_id,
+                error=JsonRpcError(code=-32600, message="Invalid Request", data=str(e)),
             ).model_dump(),
         )
-
-    # Validate JSON-RPC envelope
-    try:
-        rpc_request = JsonRpcRequest(**body)
-        rpc_id = rpc_request.id
-    except Exception as e:
-        return JSONResponse(
+    except ValueError:
+        return ORJSONResponse(
             status_code=200,
             content=JsonRpcErrorResponse(
-                id=rpc_id,
-                error=JsonRpcError(code=-32600, message="Invalid Request", data=str(e)),
+                id=None,
+                error=JsonRpcError(code=-32700, message="Parse error"),
             ).model_dump(),
         )
 
     # Only support "invoke" method
     if rpc_request.method != "invoke":
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content=JsonRpcErrorResponse(
                 id=rpc_id,
@@ -319,7 +721,7 @@ async def handle_rpc(
 
     # Validate params
     if not rpc_request.params:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content=JsonRpcErrorResponse(
                 id=rpc_id,
@@ -329,7 +731,7 @@ async def handle_rpc(
 
     # Check skill ID
     if rpc_request.params.skill != "review.security.python":
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content=JsonRpcErrorResponse(
                 id=rpc_id,
@@ -342,18 +744,11 @@ async def handle_rpc(
 
     # Execute the skill
     try:
-        findings = analyze_diff(rpc_request.params.input.diff)
-        result = ReviewResult(findings=findings)
+        findings = await analyze_diff_cached(rpc_request.params.input.diff)
 
-        return JSONResponse(
-            status_code=200,
-            content=JsonRpcSuccessResponse(
-                id=rpc_id,
-                result=result.model_dump(),
-            ).model_dump(),
-        )
+        return findings_response(rpc_request.id, findings)
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content=JsonRpcErrorResponse(
                 id=rpc_id,
@@ -369,4 +764,14 @@ async def handle_rpc(
 if __name__ == "__main__":
     import uvicorn
     print(f"Python Security Agent listening on http://127.0.0.1:{PORT}")
-    uvicorn.run(app, host="127.0.0.1", port=PORT, log_level="warning")
+    uvicorn.run(
+        app,
+        host="127.0.0.1",
+        port=PORT,
+        log_level="warning",
+        # "auto" picks the libuv event loop and C HTTP parser pinned in
+        # requirements.txt when they are installed (uvloop has no Windows
+        # build), and falls back to asyncio and h11 when they are not
+        loop="auto",
+        http="auto",
+    )
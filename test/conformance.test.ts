@@ -1486,11 +1486,11 @@ describe("Python Cross-Implementation", () => {
   const PYTHON_AGENT_PORT = 9210;
   const PYTHON_AGENT_URL = `http://127.0.0.1:${PYTHON_AGENT_PORT}`;
 
-  // Check if Python and uvicorn are available
+  // Check if Python and the agent's required packages are available
   const checkPythonAvailable = async (): Promise<boolean> => {
     try {
       const result = spawn({
-        cmd: ["python3", "-c", "import fastapi, uvicorn; print('ok')"],
+        cmd: ["python3", "-c", "import fastapi, orjson, uvicorn; print('ok')"],
         stdout: "pipe",
         stderr: "pipe",
       });
@@ -1605,6 +1605,242 @@ describe("Python Cross-Implementation", () => {
     expect(passwordFinding.severity).toBe("critical");
   }, 10000);
 
+  test("Python agent reports every secret on a line in position order (if Python available)", async () => {
+    const pythonAvailable = await checkPythonAvailable();
+    if (!pythonAvailable) {
+      console.warn("Skipping Python agent test - Python/FastAPI not available");
+      return;
+    }
+
+    // Start Python agent
+    pythonAgentProc = spawn({
+      cmd: ["python3", `${ROOT}/agents/python-security/agent.py`],
+      cwd: ROOT,
+      stdout: "pipe",
+      stderr: "pipe",
+    });
+
+    // Wait for agent to start
+    await new Promise((r) => setTimeout(r, 2000));
+
+    const longValue = "x".repeat(300);
+    const diff = `+++ b/config.py
+@@ -0,0 +1,3 @@
++API_KEY = "sk_test_inner" # ghp_tail
++PASSWORD = "${longValue}"
++password = "unterminated`;
+
+    const response = await fetch(`${PYTHON_AGENT_URL}/rpc`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        jsonrpc: "2.0",
+        id: "python-test-every-match",
+        method: "invoke",
+        params: {
+          skill: "review.security.python",
+          input: { diff, mcp_url: TOOL_SERVER_URL },
+        },
+      }),
+    });
+
+    expect(response.ok).toBe(true);
+
+    const result = await response.json();
+    const findings: z.infer<typeof FindingSchema>[] = result.result.findings;
+
+    // Nested and trailing tokens are reported alongside the assignment
+    expect(findings.map((f) => [f.title, f.evidence, f.file, f.line])).toEqual([
+      ["API Key", 'Found: API_KEY = "sk_test_inner"', "config.py", 1],
+      ["Stripe API Key", "Found: sk_test_inner", "config.py", 1],
+      ["GitHub Token", "Found: ghp_tail", "config.py", 1],
+      ["Hardcoded password", `Found: PASSWORD = "${"x".repeat(256)}`, "config.py", 2],
+    ]);
+  }, 10000);
+
+  test("Python agent tracks files and line numbers across hunks (if Python available)", async () => {
+    const pythonAvailable = await checkPythonAvailable();
+    if (!pythonAvailable) {
+      console.warn("Skipping Python agent test - Python/FastAPI not available");
+      return;
+    }
+
+    // Start Python agent
+    pythonAgentProc = spawn({
+      cmd: ["python3", `${ROOT}/agents/python-security/agent.py`],
+      cwd: ROOT,
+      stdout: "pipe",
+      stderr: "pipe",
+    });
+
+    // Wait for agent to start
+    await new Promise((r) => setTimeout(r, 2000));
+
+    // Several thousand lines, so multi-CPU hosts split the diff between
+    // scan workers at hunk headers
+    const diffLines: string[] = [];
+    const expected: [string, string, number][] = [];
+    for (let f = 0; f < 3; f++) {
+      const file = `src/module${f}.py`;
+      diffLines.push(`diff --git a/${file} b/${file}`, `--- a/${file}`, `+++ b/${file}`);
+      for (let h = 0; h < 20; h++) {
+        let line = h * 100 + 1;
+        diffLines.push(`@@ -${line},30 +${line},30 @@ def handler_${h}():`);
+        for (let i = 0; i < 40; i++) {
+          if (i % 4 === 1) {
+            // Removed lines take no new-file line number
+            diffLines.push(`-    removed_${i} = ${i}`);
+            continue;
+          }
+          if (i % 10 === 3) {
+            const token = `ghp_f${f}h${h}i${i}`;
+            diffLines.push(`+    TOKEN = "${token}"`);
+            expected.push([`Found: ${token}`, file, line]);
+          } else if (i % 2 === 0) {
+            diffLines.push(`     context_${i} = ${i}`);
+          } else {
+            diffLines.push(`+    added_${i} = ${i}`);
+          }
+          line++;
+        }
+      }
+    }
+
+    const response = await fetch(`${PYTHON_AGENT_URL}/rpc`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        jsonrpc: "2.0",
+        id: "python-test-lines",
+        method: "invoke",
+        params: {
+          skill: "review.security.python",
+          input: { diff: diffLines.join("\n"), mcp_url: TOOL_SERVER_URL },
+        },
+      }),
+    });
+
+    expect(response.ok).toBe(true);
+
+    const result = await response.json();
+    const findings: z.infer<typeof FindingSchema>[] = result.result.findings;
+    expect(findings.map((f) => [f.evidence, f.file, f.line])).toEqual(expected);
+  }, 10000);
+
+  test("Python agent port is free after a killed agent (if Python available)", async () => {
+    const pythonAvailable = await checkPythonAvailable();
+    if (!pythonAvailable) {
+      console.warn("Skipping Python agent test - Python/FastAPI not available");
+      return;
+    }
+
+    const startAgent = () =>
+      spawn({
+        cmd: ["python3", `${ROOT}/agents/python-security/agent.py`],
+        cwd: ROOT,
+        stdout: "pipe",
+        stderr: "pipe",
+      });
+
+    // Start Python agent
+    pythonAgentProc = startAgent();
+
+    // Wait for agent to start
+    await new Promise((r) => setTimeout(r, 2000));
+
+    // A diff large enough to start the scan workers on multi-CPU hosts
+    const diffLines = ["+++ b/big.py"];
+    for (let i = 0; i < 3000; i++) {
+      if (i % 50 === 0) diffLines.push(`@@ -${i + 1},50 +${i + 1},50 @@`);
+      diffLines.push(i % 100 === 7 ? `+TOKEN = "ghp_big${i}"` : `+value_${i} = ${i}`);
+    }
+    const response = await fetch(`${PYTHON_AGENT_URL}/rpc`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        jsonrpc: "2.0",
+        id: "python-test-restart",
+        method: "invoke",
+        params: {
+          skill: "review.security.python",
+          input: { diff: diffLines.join("\n"), mcp_url: TOOL_SERVER_URL },
+        },
+      }),
+    });
+    expect((await response.json()).result.findings).toHaveLength(30);
+
+    // Workers must not keep the listening socket once the agent is killed
+    pythonAgentProc.kill("SIGKILL");
+    await pythonAgentProc.exited;
+
+    pythonAgentProc = startAgent();
+    await new Promise((r) => setTimeout(r, 2000));
+
+    const health = await fetch(`${PYTHON_AGENT_URL}/health`, { signal: AbortSignal.timeout(2000) });
+    expect(health.ok).toBe(true);
+    expect(pythonAgentProc.exitCode).toBeNull();
+  }, 15000);
+
+  test("Python agent maps request body errors to JSON-RPC codes (if Python available)", async () => {
+    const pythonAvailable = await checkPythonAvailable();
+    if (!pythonAvailable) {
+      console.warn("Skipping Python agent test - Python/FastAPI not available");
+      return;
+    }
+
+    // Start Python agent
+    pythonAgentProc = spawn({
+      cmd: ["python3", `${ROOT}/agents/python-security/agent.py`],
+      cwd: ROOT,
+      stdout: "pipe",
+      stderr: "pipe",
+    });
+
+    // Wait for agent to start
+    await new Promise((r) => setTimeout(r, 2000));
+
+    const post = async (body: string, headers: Record<string, string> = {}) => {
+      const response = await fetch(`${PYTHON_AGENT_URL}/rpc`, { method: "POST", headers, body });
+      expect(response.ok).toBe(true);
+      return response.json();
+    };
+
+    // Unparseable or empty bodies are parse errors
+    for (const body of ["{not json", ""]) {
+      const result = await post(body, { "Content-Type": "application/json" });
+      expect(result.id).toBeNull();
+      expect(result.error.code).toBe(-32700);
+    }
+
+    // Valid JSON that is not a request object is an invalid request
+    for (const body of ["null", "[]", JSON.stringify({ jsonrpc: "2.0" })]) {
+      const result = await post(body, { "Content-Type": "application/json" });
+      expect(result.error.code).toBe(-32600);
+    }
+
+    // The body is read as JSON whatever Content-Type the client sent
+    const request = JSON.stringify({
+      jsonrpc: "2.0",
+      id: "python-content-type",
+      method: "invoke",
+      params: {
+        skill: "review.security.python",
+        input: { diff: '+++ b/config.py\n+PASSWORD = "hunter2"', mcp_url: TOOL_SERVER_URL },
+      },
+    });
+    for (const contentType of ["text/plain", "application/x-www-form-urlencoded"]) {
+      const result = await post(request, { "Content-Type": contentType });
+      expect(result.id).toBe("python-content-type");
+      expect(result.result.findings).toHaveLength(1);
+    }
+
+    // A lone surrogate escape ("\ud800") is valid JSON, so the diff is scanned
+    const surrogateRequest = request.replace("hunter2", "\\ud800");
+    expect(surrogateRequest).toContain("\\ud800");
+    const surrogateResult = await post(surrogateRequest, { "Content-Type": "application/json" });
+    expect(surrogateResult.result.findings).toHaveLength(1);
+  }, 10000);
+
   test("Python agent compatible with orchestrator discovery (if Python available)", async () => {
     const pythonAvailable = await checkPythonAvailable();
     if (!pythonAvailable) {